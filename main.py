@@ -5,17 +5,21 @@ import aiosmtplib
 import dns.asyncresolver
 import dns.resolver
 import re
+import itertools
 import socket
-import boto3
+import aioboto3
+import botocore.config
 import logging
 import aiofiles
+import uvloop
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from collections import defaultdict
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from functools import lru_cache
 from contextlib import asynccontextmanager
-from asyncio import Lock
+from operator import attrgetter
+from asyncio import Lock, Semaphore
 from time import monotonic
 
 # ─────────────────────────── Configuration & Constants ─────────────────────────── #
@@ -39,44 +43,78 @@ class Config:
     output_file: str = os.getenv("LOCAL_OUTPUT_FILE", "results.json")
     smtp_rate_limit: float = float(os.getenv("SMTP_RATE_LIMIT", 10.0))
     smtp_burst_capacity: int = int(os.getenv("SMTP_BURST_CAPACITY", 20))
+    smtp_pool_size: int = int(os.getenv("SMTP_POOL_SIZE", 5))
+    smtp_max_uses: int = int(os.getenv("SMTP_MAX_USES", 100))
+    mx_cache_ttl: int = int(os.getenv("MX_CACHE_TTL", 300))
+    mx_negative_cache_ttl: int = int(os.getenv("MX_NEGATIVE_CACHE_TTL", 60))
+    dns_cache_max_size: int = int(os.getenv("DNS_CACHE_MAX_SIZE", 10000))
 
 CONFIG = Config()
 
+# libuv-based loop for every asyncio.run() below; faster socket I/O for the DNS/SMTP/DynamoDB fanout
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 DISPOSABLE_EMAIL_DOMAINS = frozenset({
     "mailinator.com", "guerrillamail.com", "tempmail.com", "10minutemail.com"
 })
 
+# Also rejects subdomains of disposable providers (e.g. foo.mailinator.com) via str.endswith
+DISPOSABLE_EMAIL_SUFFIXES = tuple("." + domain for domain in DISPOSABLE_EMAIL_DOMAINS)
+
 ROLE_BASED_EMAILS = frozenset({"admin", "support", "info", "noreply", "sales", "contact"})
 
-EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+# Resolved once at import: socket.getfqdn() does a blocking reverse-DNS lookup
+EHLO_HOSTNAME = os.getenv("EHLO_HOSTNAME") or socket.getfqdn() or socket.gethostname()
+
+# Catch-all probe addresses only need to miss real mailboxes, not be cryptographically random
+CATCH_ALL_COUNTER = itertools.count()
+
+MX_PREFERENCE = attrgetter("preference")
+
+EMAIL_REGEX = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$", re.ASCII)
+
+# ─────────────────────────── AWS Clients ─────────────────────────── #
+
+# Each invocation runs its own event loop and the aiohttp-backed resource is bound to it, so a new
+# resource (HTTP connection and TLS handshake to DynamoDB) is opened per invocation. Only the session
+# and its credential lookup are reused across warm invocations.
+DDB_SESSION = aioboto3.Session()
+DDB_CONFIG = botocore.config.Config(retries={"max_attempts": 3, "mode": "adaptive"})
+DDB_TABLE_NAME = os.getenv("DDB_TABLE", "email_verification_results")
 
 # ─────────────────────────── Rate Limiter ─────────────────────────── #
 
 class RateLimiter:
+    """Token bucket where callers reserve a token without awaiting and then sleep off any deficit."""
     def __init__(self, rate: float, capacity: int):
         self.rate = rate
         self.capacity = capacity
         self.tokens = capacity
         self.last_refill = monotonic()
-        self.lock = Lock()
 
     async def acquire(self):
-        async with self.lock:
-            await self._refill()
-            while self.tokens < 1:
-                wait_time = (1 - self.tokens) / self.rate
-                logger.debug(f"Rate limit hit, waiting {wait_time:.2f}s")
-                await asyncio.sleep(wait_time)
-                await self._refill()
-            self.tokens -= 1
-
-    async def _refill(self):
+        self._refill()
+        self.tokens -= 1
+        if self.tokens < 0:
+            wait_time = -self.tokens / self.rate
+            logger.debug("Rate limit hit, waiting %.2fs", wait_time)
+            await asyncio.sleep(wait_time)
+
+    def _refill(self):
         now = monotonic()
         elapsed = now - self.last_refill
         new_tokens = elapsed * self.rate
         self.tokens = min(self.capacity, self.tokens + new_tokens)
         self.last_refill = now
 
+# ─────────────────────────── SMTP Connection Pool ─────────────────────────── #
+
+@dataclass
+class PooledSMTP:
+    """An SMTP connection owned by a per-MX pool, with the number of transactions it has served."""
+    client: aiosmtplib.SMTP
+    uses: int = 0
+
 # ─────────────────────────── Advanced Async Email Verification ─────────────────────────── #
 
 class EmailVerifier:
@@ -85,186 +123,388 @@ class EmailVerifier:
         self.resolver.timeout = CONFIG.socket_timeout
         self.resolver.lifetime = CONFIG.socket_timeout
         self.rate_limiter = RateLimiter(CONFIG.smtp_rate_limit, CONFIG.smtp_burst_capacity)
-        self.dynamodb = boto3.resource("dynamodb")
-        self.table = self.dynamodb.Table(os.getenv("DDB_TABLE", "email_verification_results"))
-        logger.info(f"Initialized DynamoDB table: {self.table.name}")
+        self._dns_cache: Dict[Tuple[str, str], Tuple[float, List[str]]] = {}
+        self._dns_locks: Dict[Tuple[str, str], Lock] = defaultdict(Lock)
+        self._smtp_idle: Dict[str, List[PooledSMTP]] = defaultdict(list)
+        self._smtp_slots: Dict[str, Semaphore] = defaultdict(lambda: Semaphore(CONFIG.smtp_pool_size))
 
-    @lru_cache(maxsize=1000)
     def validate_syntax(self, email: str) -> bool:
         is_valid = bool(EMAIL_REGEX.match(email))
-        logger.info(f"Validating syntax for {email}: {is_valid}")
+        logger.info("Validating syntax for %s: %s", email, is_valid)
         return is_valid
 
+    async def _connect_smtp(self, mx_host: str) -> aiosmtplib.SMTP:
+        """Connect to an MX host by address, trying each cached A record in turn.
+
+        Addresses are resolved lazily, one MX host at a time as it is contacted, rather than
+        pre-resolving every MX in parallel: backup MX hosts are rarely reached. Connecting by
+        address lets aiosmtplib skip its own getaddrinfo; with no A records we fall back to
+        the hostname.
+        """
+        addresses = await self.get_host_addresses(mx_host) or [mx_host]
+        for attempt, address in enumerate(addresses, 1):
+            client = aiosmtplib.SMTP(
+                hostname=address,
+                port=25,
+                local_hostname=EHLO_HOSTNAME,
+                start_tls=False,
+                timeout=CONFIG.smtp_timeout
+            )
+            try:
+                await client.connect()
+                return client
+            except aiosmtplib.SMTPConnectError as e:
+                if attempt == len(addresses):
+                    raise
+                logger.info("SMTP connect to %s via %s failed, trying next address: %s", mx_host, address, e)
+
+    async def _acquire_smtp(self, mx_host: str) -> PooledSMTP:
+        await self._smtp_slots[mx_host].acquire()
+        client = None
+        try:
+            idle = self._smtp_idle[mx_host]
+            while idle:
+                pooled = idle.pop()
+                if pooled.client.is_connected:
+                    return pooled
+            client = await self._connect_smtp(mx_host)
+            # STARTTLS is done by hand so the certificate is checked against the MX name, not the IP
+            await client.ehlo()
+            if client.supports_extension("starttls"):
+                await client.starttls(server_hostname=mx_host)
+                # STARTTLS discards the pre-TLS EHLO state (RFC 3207)
+                await client.ehlo()
+            return PooledSMTP(client)
+        except BaseException:
+            # A connected client whose EHLO/STARTTLS failed must not be left open
+            if client is not None:
+                await self._close_smtp(PooledSMTP(client))
+            self._smtp_slots[mx_host].release()
+            raise
+
+    async def _release_smtp(self, mx_host: str, pooled: PooledSMTP, reusable: bool) -> None:
+        try:
+            pooled.uses += 1
+            if reusable and pooled.uses < CONFIG.smtp_max_uses:
+                try:
+                    await pooled.client.rset()
+                    self._smtp_idle[mx_host].append(pooled)
+                    return
+                except Exception as e:
+                    logger.debug("RSET failed on %s, dropping connection: %s", mx_host, e)
+            await self._close_smtp(pooled)
+        finally:
+            self._smtp_slots[mx_host].release()
+
+    async def _close_smtp(self, pooled: PooledSMTP) -> None:
+        try:
+            await pooled.client.quit()
+        except Exception:
+            pooled.client.close()
+
     @asynccontextmanager
     async def smtp_client(self, mx_host: str) -> aiosmtplib.SMTP:
+        """Check out a pooled connection; it is reset and returned on success, dropped on error."""
         await self.rate_limiter.acquire()
-        client = aiosmtplib.SMTP(hostname=mx_host, port=25, timeout=CONFIG.smtp_timeout)
+        pooled = await self._acquire_smtp(mx_host)
+        reusable = False
         try:
-            await client.connect()
-            yield client
+            yield pooled.client
+            reusable = True
         finally:
+            await self._release_smtp(mx_host, pooled, reusable)
+
+    async def close(self) -> None:
+        """Quit idle SMTP connections, drop loop-bound primitives and expired DNS entries."""
+        idle = [pooled for pool in self._smtp_idle.values() for pooled in pool]
+        self._smtp_idle.clear()
+        self._smtp_slots.clear()
+        self._dns_locks.clear()
+        self._prune_dns_cache()
+        await asyncio.gather(*[self._close_smtp(pooled) for pooled in idle])
+
+    def _cached_records(self, key: Tuple[str, str]) -> Optional[List[str]]:
+        entry = self._dns_cache.get(key)
+        if entry is not None and entry[0] > monotonic():
+            return entry[1]
+        return None
+
+    def _prune_dns_cache(self) -> None:
+        now = monotonic()
+        for key in [key for key, (expiry, _) in self._dns_cache.items() if expiry <= now]:
+            del self._dns_cache[key]
+
+    def _store_records(self, key: Tuple[str, str], ttl: float, records: List[str]) -> None:
+        # Re-insert at the end so dict order is insertion time and the oldest entry is evicted first
+        self._dns_cache.pop(key, None)
+        while len(self._dns_cache) >= CONFIG.dns_cache_max_size:
+            del self._dns_cache[next(iter(self._dns_cache))]
+        self._dns_cache[key] = (monotonic() + ttl, records)
+
+    async def _resolve_cached(self, name: str, rdtype: str, parse: Callable[[Any], List[str]]) -> List[str]:
+        key = (name, rdtype)
+        cached = self._cached_records(key)
+        if cached is not None:
+            return cached
+        # Coalesce concurrent misses for the same name into a single DNS query
+        async with self._dns_locks[key]:
+            cached = self._cached_records(key)
+            if cached is not None:
+                logger.debug("%s cache hit for %s after waiting on in-flight lookup", rdtype, name)
+                return cached
             try:
-                await client.quit()
-            except:
-                pass
-
-    async def get_mx_records(self, domain: str) -> List[str]:
-        try:
-            answers = await self.resolver.resolve(domain, "MX")
-            mx_records = [str(r.exchange).rstrip('.') for r in sorted(answers, key=lambda x: x.preference)]
-            logger.info(f"MX records for {domain}: {mx_records}")
-            return mx_records
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
-            logger.info(f"No MX records for {domain}: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"MX lookup failed for {domain}: {e}")
-            return []
+                answers = await self.resolver.resolve(name, rdtype)
+                records = parse(answers)
+                self._store_records(key, min(answers.rrset.ttl, CONFIG.mx_cache_ttl), records)
+                logger.info("%s records for %s: %s", rdtype, name, records)
+                return records
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+                self._store_records(key, CONFIG.mx_negative_cache_ttl, [])
+                logger.info("No %s records for %s: %s", rdtype, name, e)
+                return []
+            except Exception as e:
+                logger.error("%s lookup failed for %s: %s", rdtype, name, e)
+                return []
 
-    async def check_smtp_connection(self, mx_host: str) -> bool:
-        try:
-            sock = socket.create_connection((mx_host, 25), timeout=CONFIG.socket_timeout)
-            sock.close()
-            logger.info(f"SMTP connection successful for {mx_host}")
-            return True
-        except Exception as e:
-            logger.info(f"SMTP unreachable for {mx_host}: {e}")
-            return False
+    @staticmethod
+    def _parse_mx(answers) -> List[str]:
+        records = list(answers)
+        if len(records) > 1:
+            records.sort(key=MX_PREFERENCE)
+        return [str(r.exchange).rstrip('.') for r in records]
 
-    async def verify_smtp(self, email: str, mx_records: List[str]) -> Dict[str, str]:
-        result = {"email": email, "status": "undeliverable", "reason": ""}
+    async def get_mx_records(self, domain: str) -> List[str]:
+        return await self._resolve_cached(domain, "MX", self._parse_mx)
+
+    async def get_host_addresses(self, host: str) -> List[str]:
+        return await self._resolve_cached(host, "A", lambda answers: [r.address for r in answers])
+
+    def _classify_rcpt(self, email: str, code: int, message: str) -> Optional[Dict[str, str]]:
+        if code == 250:
+            return {"email": email, "status": "valid", "reason": "Mailbox exists"}
+        elif code in (550, 551, 552, 553):
+            return {"email": email, "status": "invalid", "reason": f"Mailbox rejected: {message}"}
+        elif code in (421, 451, 452):
+            return {"email": email, "status": "retry_later", "reason": f"Temporary failure: {message}"}
+        return None
+
+    def _catch_all_probe(self, domain: str) -> str:
+        return f"fakeuser-{next(CATCH_ALL_COUNTER):x}-{int(monotonic() * 1000):x}@{domain}"
+
+    async def verify_smtp_bulk(
+        self, emails: List[str], mx_records: List[str], check_catch_all: bool = False
+    ) -> Dict[str, Dict[str, str]]:
+        """Verify several mailboxes of one domain, sharing a single SMTP session per MX host.
+
+        With check_catch_all, a random mailbox is probed in the same transaction; if the
+        server accepts it, accepted addresses are reported as "caution" instead of "valid".
+        """
+        results = {email: {"email": email, "status": "undeliverable", "reason": ""} for email in emails}
+        pending = list(dict.fromkeys(emails))
+        catch_all: Optional[bool] = None
         for mx in mx_records:
+            if not pending:
+                break
             try:
                 async with self.smtp_client(mx) as client:
-                    await client.ehlo(socket.getfqdn())
                     await client.mail(CONFIG.sender_email)
-                    code, message = await client.rcpt(email)
-                    logger.info(f"SMTP response for {email} from {mx}: {code} {message}")
-                    if code == 250:
-                        return {"email": email, "status": "valid", "reason": "Mailbox exists"}
-                    elif code in (550, 551, 552, 553):
-                        return {"email": email, "status": "invalid", "reason": f"Mailbox rejected: {message}"}
-                    elif code in (421, 451, 452):
-                        return {"email": email, "status": "retry_later", "reason": f"Temporary failure: {message}"}
-                    else:
-                        result["reason"] = f"Unexpected SMTP code: {code} {message}"
+                    if check_catch_all and catch_all is None:
+                        test_email = self._catch_all_probe(pending[0].rpartition("@")[2])
+                        try:
+                            code, _ = await client.rcpt(test_email)
+                        except aiosmtplib.SMTPRecipientRefused as e:
+                            code = e.code
+                        logger.info("Catch-all test response for %s from %s: %s", test_email, mx, code)
+                        catch_all = code == 250
+                    # Iterate over a copy: decided addresses leave pending as soon as they are
+                    # classified, so a session dropped mid-loop only affects the undecided ones
+                    for email in list(pending):
+                        try:
+                            code, message = await client.rcpt(email)
+                        except aiosmtplib.SMTPRecipientRefused as e:
+                            code, message = e.code, e.message
+                        logger.info("SMTP response for %s from %s: %s %s", email, mx, code, message)
+                        result = self._classify_rcpt(email, code, message)
+                        if result is not None:
+                            if catch_all and code == 250:
+                                result = {"email": email, "status": "caution", "reason": "Catch-all domain"}
+                            results[email] = result
+                            pending.remove(email)
+                        else:
+                            results[email]["reason"] = f"Unexpected SMTP code: {code} {message}"
             except aiosmtplib.SMTPException as e:
-                result["reason"] = f"SMTP error with {mx}: {e}"
+                for email in pending:
+                    results[email]["reason"] = f"SMTP error with {mx}: {e}"
             except Exception as e:
-                result["reason"] = f"Connection error with {mx}: {e}"
-        logger.info(f"SMTP verification result for {email}: {result}")
-        return result
+                for email in pending:
+                    results[email]["reason"] = f"Connection error with {mx}: {e}"
+        logger.info("SMTP verification results: %s", results)
+        return results
+
+    async def verify_smtp(self, email: str, mx_records: List[str]) -> Dict[str, str]:
+        results = await self.verify_smtp_bulk([email], mx_records)
+        return results[email]
+
+    async def verify_smtp_with_catchall(self, email: str, mx_records: List[str]) -> Dict[str, str]:
+        """Like verify_smtp, but also runs the catch-all probe over the same SMTP session."""
+        results = await self.verify_smtp_bulk([email], mx_records, check_catch_all=True)
+        return results[email]
 
     async def is_catch_all(self, domain: str, mx_records: List[str]) -> bool:
-        test_email = f"fakeuser{os.urandom(4).hex()}@{domain}"
-        logger.info(f"Testing catch-all with {test_email}")
+        test_email = self._catch_all_probe(domain)
+        logger.info("Testing catch-all with %s", test_email)
         for mx in mx_records:
             try:
                 async with self.smtp_client(mx) as client:
-                    await client.ehlo(socket.getfqdn())
                     await client.mail(CONFIG.sender_email)
                     code, _ = await client.rcpt(test_email)
-                    logger.info(f"Catch-all test response for {test_email} from {mx}: {code}")
+                    logger.info("Catch-all test response for %s from %s: %s", test_email, mx, code)
                     if code == 250:
                         return True
             except:
                 continue
         return False
 
-    async def process_email(self, email: str) -> Dict[str, str]:
-        logger.info(f"Processing email: {email}")
+    def precheck(self, email: str) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        """Run the local checks; returns (domain, None) when the email still needs a DNS lookup."""
+        logger.info("Processing email: %s", email)
         if not self.validate_syntax(email):
             result = {"email": email, "status": "invalid", "reason": "Invalid syntax"}
-            logger.info(f"Early return due to invalid syntax: {result}")
-            return result
+            logger.info("Early return due to invalid syntax: %s", result)
+            return None, result
 
-        local_part, domain = email.rsplit("@", 1)
-        domain, local_part = domain.lower(), local_part.lower()
-        logger.info(f"Extracted domain: {domain}, local_part: {local_part}")
+        local_part, _, domain = email.rpartition("@")
+        # Addresses usually arrive lowercase already; skip the copy when they do
+        domain = domain if domain.islower() else domain.lower()
+        local_part = local_part if local_part.islower() else local_part.lower()
+        logger.info("Extracted domain: %s, local_part: %s", domain, local_part)
 
-        if domain in DISPOSABLE_EMAIL_DOMAINS:
+        if domain in DISPOSABLE_EMAIL_DOMAINS or domain.endswith(DISPOSABLE_EMAIL_SUFFIXES):
             result = {"email": email, "status": "invalid", "reason": "Disposable email"}
-            logger.info(f"Disposable email detected: {result}")
-            return result
+            logger.info("Disposable email detected: %s", result)
+            return None, result
 
         if local_part in ROLE_BASED_EMAILS:
             result = {"email": email, "status": "caution", "reason": "Role-based email"}
-            logger.info(f"Role-based email detected: {result}")
-            return result
+            logger.info("Role-based email detected: %s", result)
+            return None, result
 
+        return domain, None
+
+    async def process_domain(self, domain: str, emails: List[str]) -> List[Dict[str, str]]:
+        """Resolve MX once for a domain and build the results for all of its emails."""
         mx_records = await self.get_mx_records(domain)
-        if not mx_records:
-            result = {"email": email, "status": "invalid", "reason": "No MX records found"}
-            logger.info(f"No MX records: {result}")
-        else:
-            result = {"email": email, "status": "valid", "reason": "MX records found"}  # Simplified for testing
-            logger.info(f"MX records found: {result}")
-
-        # DynamoDB write
-        logger.info(f"Attempting DynamoDB operation for {email}")
-        try:
-            logger.info(f"Checking if {email} exists in DynamoDB")
-            existing = await asyncio.to_thread(self.table.get_item, Key={"email": email})
-            if "Item" in existing:
-                logger.info(f"Existing record found: {existing['Item']}")
-                logger.info(f"Updating DynamoDB with: {result}")
-                await asyncio.to_thread(
-                    self.table.update_item,
-                    Key={"email": email},
-                    UpdateExpression="SET #s = :status, #r = :reason",
-                    ExpressionAttributeNames={"#s": "status", "#r": "reason"},
-                    ExpressionAttributeValues={
-                        ":status": result["status"],
-                        ":reason": result["reason"]
-                    }
-                )
-                logger.info(f"Successfully updated DynamoDB record for {email}")
+        results = []
+        for email in emails:
+            if not mx_records:
+                result = {"email": email, "status": "invalid", "reason": "No MX records found"}
+                logger.info("No MX records: %s", result)
             else:
-                logger.info(f"No existing record, inserting: {result}")
-                await asyncio.to_thread(self.table.put_item, Item=result)
-                logger.info(f"Successfully inserted DynamoDB record for {email}")
-        except Exception as e:
-            logger.error(f"DynamoDB operation failed for {email}: {e}", exc_info=True)
+                result = {"email": email, "status": "valid", "reason": "MX records found"}  # Simplified for testing
+                logger.info("MX records found: %s", result)
+            results.append(result)
+        return results
 
-        return result
+    async def process_email(self, email: str) -> Dict[str, str]:
+        domain, result = self.precheck(email)
+        if result is not None:
+            return result
+        results = await self.process_domain(domain, [email])
+        return results[0]
+
+    async def process_batch(self, emails: List[str]) -> List[Dict[str, str]]:
+        """Process emails in input order, grouping them by domain so each domain is resolved once."""
+        results: List[Optional[Dict[str, str]]] = [None] * len(emails)
+        by_domain: Dict[str, List[int]] = defaultdict(list)
+        for i, email in enumerate(emails):
+            domain, result = self.precheck(email)
+            if result is not None:
+                results[i] = result
+            else:
+                by_domain[domain].append(i)
+
+        logger.info("%d emails need MX checks across %d domains", sum(map(len, by_domain.values())), len(by_domain))
+        # BATCH_SIZE bounds how many domains are verified at once, replacing the old fixed-size chunks
+        limit = Semaphore(CONFIG.batch_size)
+
+        async def process_group(domain: str) -> List[Dict[str, str]]:
+            async with limit:
+                return await self.process_domain(domain, [emails[i] for i in by_domain[domain]])
+
+        domains = list(by_domain)
+        domain_results = await asyncio.gather(*[process_group(domain) for domain in domains])
+        for domain, group_results in zip(domains, domain_results):
+            for i, result in zip(by_domain[domain], group_results):
+                results[i] = result
+        return results
+
+    @asynccontextmanager
+    async def results_writer(self):
+        """Open a DynamoDB batch writer; items are sent 25 per BatchWriteItem request."""
+        async with DDB_SESSION.resource("dynamodb", config=DDB_CONFIG) as dynamodb:
+            table = await dynamodb.Table(DDB_TABLE_NAME)
+            async with table.batch_writer(overwrite_by_pkeys=["email"]) as writer:
+                yield writer
+
+    async def save_results(self, results: List[Dict[str, str]]) -> None:
+        logger.info("Writing %d results to DynamoDB table %s", len(results), DDB_TABLE_NAME)
+        try:
+            async with self.results_writer() as writer:
+                for result in results:
+                    await writer.put_item(Item=result)
+            logger.info("Successfully wrote %d results to DynamoDB", len(results))
+        except Exception as e:
+            logger.error("DynamoDB batch write failed: %s", e, exc_info=True)
 
 # ─────────────────────────── AWS Lambda Entry Point ─────────────────────────── #
 
+# Kept across warm invocations so the DNS cache and resolver setup are reused
+_VERIFIER: Optional[EmailVerifier] = None
+
+def _get_verifier() -> EmailVerifier:
+    global _VERIFIER
+    if _VERIFIER is None:
+        _VERIFIER = EmailVerifier()
+    return _VERIFIER
+
 def lambda_handler(event, context):
     """AWS Lambda entry point for SQS trigger with DynamoDB storage."""
-    logger.info(f"Received event: {json.dumps(event)}")
+    logger.info("Received event with %d records", len(event.get("Records", [])))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Event body: %s", json.dumps(event)[:4096])
     async def process_emails(emails: List[str]) -> List[Dict[str, str]]:
-        verifier = EmailVerifier()
-        results = []
-        logger.info(f"Processing {len(emails)} emails")
-        for i in range(0, len(emails), CONFIG.batch_size):
-            batch = emails[i:i + CONFIG.batch_size]
-            batch_results = await asyncio.gather(*[verifier.process_email(email) for email in batch])
-            results.extend(batch_results)
-            logger.info(f"Processed batch {i // CONFIG.batch_size + 1}: {len(batch)} emails")
-        logger.info(f"All results: {results}")
+        verifier = _get_verifier()
+        logger.info("Processing %d emails", len(emails))
+        try:
+            results = await verifier.process_batch(emails)
+            # Written once after verification: SQS delivers at most 10 records and the batch writer
+            # flushes every 25 items, so streaming results into it would not overlap any I/O
+            await verifier.save_results(results)
+        finally:
+            await verifier.close()
+        logger.info("All results: %s", results)
         return results
 
     try:
         # Extract emails from SQS event
         sqs_records = event.get("Records", [])
-        logger.info(f"Found {len(sqs_records)} SQS records")
+        logger.info("Found %d SQS records", len(sqs_records))
         if not sqs_records:
             logger.warning("No SQS records found in event")
             return {"statusCode": 200, "body": json.dumps({"message": "No emails to process"})}
 
         emails = [record["body"] for record in sqs_records]
-        logger.info(f"Extracted emails: {emails}")
+        logger.info("Extracted emails: %s", emails)
         if not emails:
             logger.warning("No valid emails extracted from SQS event")
             return {"statusCode": 200, "body": json.dumps({"message": "No emails to process"})}
 
         # Process emails and return results
         results = asyncio.run(process_emails(emails))
-        logger.info(f"Final results: {results}")
+        logger.info("Final results: %s", results)
         return {"statusCode": 200, "body": json.dumps({"message": "Processed emails", "results": results})}
     except Exception as e:
-        logger.error(f"Lambda execution failed: {e}", exc_info=True)
+        logger.error("Lambda execution failed: %s", e, exc_info=True)
         return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
 
 # ─────────────────────────── CLI Entry Point (for local testing) ─────────────────────────── #